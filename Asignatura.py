@@ -1,15 +1,29 @@
 from BloqueHoras import BloqueHoras, DiaSemana
 from Grupo import Grupo
-from typing import Dict, List, Optional, Set
+from operator import attrgetter
+from typing import Dict, Optional, Set, Tuple
+
+# Llave de ordenamiento implementada en C (sin un frame de Python por elemento, como pasaría con una lambda).
+_POR_ID = attrgetter('id_grupo')
 
 class Asignatura:
     """
     Representa una materia de estudio y gestiona la colección de grupos disponibles para ella.
     """
+    # Atributos fijos en lugar de un __dict__ por instancia (ver BloqueHoras).
+    __slots__ = ('_nombre', '_nombre_minusculas', '_hash', '_grupos', '_grupos_ordenados')
+
     def __init__(self, nombre: str):
         self._nombre = Asignatura._validar_nombre(nombre)
+        # El nombre no cambia nunca, así que precalculamos la versión en minúsculas y el hash que usan
+        # __eq__ y __hash__. Las asignaturas son llaves de diccionario en cada Horario generado.
+        self._nombre_minusculas = self._nombre.lower()
+        self._hash = hash(self._nombre_minusculas)
         # Usamos un diccionario para un acceso ultra-rápido a los grupos por su ID.
         self._grupos: Dict[int, Grupo] = {}
+        # Guardamos la tupla ordenada de grupos para no reordenarla en cada acceso a 'grupos'.
+        # Se invalida (None) cada vez que se agrega o elimina un grupo.
+        self._grupos_ordenados: Optional[Tuple[Grupo, ...]] = None
 
     # --- Métodos privados ---
 
@@ -27,10 +41,12 @@ class Asignatura:
         return self._nombre
 
     @property
-    def grupos(self) -> List[Grupo]:
-        """Devuelve una lista ordenada de todos los grupos disponibles."""
-        # Devolvemos los valores del diccionario, convertidos a una lista.
-        return sorted(self._grupos.values(), key=lambda g: g.id_grupo)
+    def grupos(self) -> Tuple[Grupo, ...]:
+        """Devuelve una tupla ordenada (por ID) de todos los grupos disponibles."""
+        # Solo ordenamos si la caché fue invalidada. Al ser una tupla, quien la recibe no puede modificarla.
+        if self._grupos_ordenados is None:
+            self._grupos_ordenados = tuple(sorted(self._grupos.values(), key=_POR_ID))
+        return self._grupos_ordenados
 
     # --- Métodos Públicos (La "API" de la clase) ---
 
@@ -44,6 +60,7 @@ class Asignatura:
             raise ValueError(f"El grupo con ID {grupo.id_grupo} ya existe en la asignatura '{self.nombre}'.")
 
         self._grupos[grupo.id_grupo] = grupo
+        self._grupos_ordenados = None
 
     def buscar_grupo(self, id_grupo: int) -> Optional[Grupo]:
         """Busca y devuelve un grupo por su ID. Devuelve None si no se encuentra."""
@@ -54,9 +71,14 @@ class Asignatura:
         if id_grupo not in self._grupos:
             raise KeyError(f"No se encontró un grupo con ID {id_grupo} en la asignatura '{self.nombre}'.")
         del self._grupos[id_grupo]
+        self._grupos_ordenados = None
 
     # --- Dunder Methods ---
 
+    def __len__(self) -> int:
+        """Devuelve el número de grupos disponibles para la asignatura."""
+        return len(self._grupos)
+
     def __repr__(self) -> str:
         """Representación textual del objeto, útil para debugging."""
         return f"{self.__class__.__name__}(nombre='{self.nombre}', num_grupos={len(self._grupos)})"
@@ -73,11 +95,13 @@ class Asignatura:
         """Dos asignaturas son iguales si tienen el mismo nombre."""
         if not isinstance(otro, Asignatura):
             return NotImplemented
-        return self.nombre.lower() == otro.nombre.lower()
+        # Comparar los hashes precalculados es una sola comparación de enteros y descarta casi todos los casos
+        # distintos; solo si coinciden comparamos los nombres (dos nombres distintos pueden compartir hash).
+        return self._hash == otro._hash and self._nombre_minusculas == otro._nombre_minusculas
 
     def __hash__(self) -> int:
         """El hash se basa en el nombre de la asignatura, que se asume único."""
-        return hash(self.nombre.lower())
+        return self._hash
 
 # --- Ejemplo de Uso ---
 if __name__ == "__main__":
@@ -1,18 +1,41 @@
-from enum import Enum
+from enum import IntEnum
 from datetime import time
 from functools import total_ordering
+from operator import attrgetter
 
 # Usar una enumeración (Enum) para los días de la semana. Ventajas:
 # 1. Autocompletado en IDEs.
 # 2. Evita errores por escribir mal un string (ej. "Miercoles" sin tilde).
 # 3. Centraliza los valores permitidos en un solo lugar.
-class DiaSemana(Enum):
-    LUNES = "Lunes"
-    MARTES = "Martes"
-    MIERCOLES = "Miércoles"
-    JUEVES = "Jueves"
-    VIERNES = "Viernes"
-    SABADO = "Sábado"
+# Al ser un IntEnum, cada día ES su posición en la semana (LUNES = 0), así que los días se comparan
+# y ordenan como enteros, sin tener que buscar su índice en una lista.
+class DiaSemana(IntEnum):
+    LUNES = 0
+    MARTES = 1
+    MIERCOLES = 2
+    JUEVES = 3
+    VIERNES = 4
+    SABADO = 5
+
+    @property
+    def etiqueta(self) -> str:
+        """El nombre del día para mostrar al usuario (ej. "Miércoles")."""
+        return _ETIQUETAS_DIAS[self]
+
+    def __str__(self) -> str:
+        return self.etiqueta
+
+# Los nombres legibles viven aparte porque el valor de cada miembro ahora es su posición en la semana,
+# que sirve directamente como índice de esta tupla.
+_ETIQUETAS_DIAS = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado")
+
+# Recorrer un Enum (for dia in DiaSemana) pasa por la maquinaria de la metaclase en cada iteración;
+# esta tupla guarda los días una sola vez, en orden, para los recorridos frecuentes.
+DIAS_SEMANA = tuple(DiaSemana)
+
+# La semana se representa como una tira de bits con un bit por minuto: el bit (día * 1440 + minuto) está encendido
+# si hay clase en ese minuto. Dos bloques (o grupos) chocan si y solo si sus máscaras comparten algún bit.
+MINUTOS_POR_DIA = 24 * 60
 
 # El decorador @total_ordering genera automáticamente los métodos de comparación
 # (__lt__, __le__, __gt__, __ge__) a partir de la definición de __eq__ y __lt__.
@@ -23,6 +46,11 @@ class BloqueHoras:
     Representa un intervalo de tiempo indivisible en un horario, definido por un día de la semana y horas de inicio y fin.
     Esta clase está diseñada para ser inmutable: una vez que se crea un BloqueHoras, sus propiedades (día, inicio, fin) no pueden cambiar.
     """
+    # Con __slots__ cada instancia guarda sus atributos en posiciones fijas en lugar de un __dict__:
+    # ocupa menos memoria y el acceso a atributos es más rápido. También impide agregar atributos por error.
+    __slots__ = ('_dia', '_inicio', '_fin', '_inicio_min', '_fin_min', '_clave_orden', '_hash', '_mascara',
+                 '_inicio_texto', '_fin_texto')
+
     def __init__(self, dia: DiaSemana, hora_inicio: str | time, hora_fin: str | time) -> None:
 
         # Hacemos el constructor más flexible: aceptamos tanto strings como objetos 'time'.
@@ -41,6 +69,28 @@ class BloqueHoras:
             raise ValueError(
                 f"La hora de inicio ({self._inicio}) debe ser anterior a la hora de fin ({self._fin}).")
 
+        # 4. Guardar las horas también como minutos desde la medianoche: comparar enteros es mucho más
+        #    barato que comparar objetos 'time', y estas comparaciones están en el camino más caliente.
+        #    No se pierde nada porque _validar_y_convertir_hora rechaza las horas con segundos.
+        self._inicio_min = self._inicio.hour * 60 + self._inicio.minute
+        self._fin_min = self._fin.hour * 60 + self._fin.minute
+
+        # 5. Precalcular la llave de ordenamiento que usa __lt__: el minuto de la semana en el que empieza el bloque.
+        #    Ordena igual que la tupla (día, inicio), pero es un solo entero y se compara sin crear tuplas.
+        self._clave_orden = self._dia * MINUTOS_POR_DIA + self._inicio_min
+
+        # 6. Precalcular el hash. Es seguro porque el bloque es inmutable.
+        self._hash = hash((self._dia, self._inicio, self._fin))
+
+        # 7. Precalcular la máscara de bits de la semana: (fin - inicio) bits encendidos a partir del minuto de inicio,
+        #    que es justamente la llave de ordenamiento.
+        self._mascara = ((1 << (self._fin_min - self._inicio_min)) - 1) << self._clave_orden
+
+        # 8. Precalcular las horas con formato "HH:MM": al imprimir muchos horarios, formatear objetos 'time'
+        #    en cada línea es lo más caro; así se hace una sola vez por bloque.
+        self._inicio_texto = self._inicio.strftime('%H:%M')
+        self._fin_texto = self._fin.strftime('%H:%M')
+
     # Métodos privados
     @staticmethod
     def _validar_dia(dia) -> DiaSemana:
@@ -63,19 +113,24 @@ class BloqueHoras:
 
         Raises:
             TypeError: Si el valor no es ni 'str' ni 'time'.
-            ValueError: Si el string de la hora tiene un formato incorrecto.
+            ValueError: Si el string de la hora tiene un formato incorrecto, o si la hora incluye segundos.
         """
-        if isinstance(valor, time):
-            return valor
         if isinstance(valor, str):
             try:
-                return time.fromisoformat(valor)
+                valor = time.fromisoformat(valor)
             except ValueError:
                 # Capturamos el error de formato para dar un mensaje más específico.
                 raise ValueError(f"El string para '{nombre_parametro}' ('{valor}') no tiene un formato HH:MM válido.")
+        elif not isinstance(valor, time):
+            # Si no es ni 'time' ni 'str', lanzamos un error.
+            raise TypeError(f"El argumento '{nombre_parametro}' debe ser un string en formato HH:MM o un objeto time.")
 
-        # Si no es ni 'time' ni 'str', lanzamos un error.
-        raise TypeError(f"El argumento '{nombre_parametro}' debe ser un string en formato HH:MM o un objeto time.")
+        # Los bloques trabajan con resolución de minutos (inicio_minutos, fin_minutos y la máscara de bits): una hora
+        # con segundos se truncaría en silencio y podría ocultar un choque real, así que la rechazamos.
+        if valor.second or valor.microsecond:
+            raise ValueError(f"La hora para '{nombre_parametro}' ({valor}) no tiene un formato HH:MM válido: "
+                             f"no se admiten segundos.")
+        return valor
 
     # --- Propiedades públicas de solo lectura ---
     # Exponemos los valores a través de propiedades para asegurar la inmutabilidad.
@@ -95,13 +150,36 @@ class BloqueHoras:
         """La hora de fin del bloque como un objeto time."""
         return self._fin
 
+    @property
+    def inicio_minutos(self) -> int:
+        """La hora de inicio expresada en minutos desde la medianoche (ej. 07:30 -> 450)."""
+        return self._inicio_min
+
+    @property
+    def fin_minutos(self) -> int:
+        """La hora de fin expresada en minutos desde la medianoche."""
+        return self._fin_min
+
+    @property
+    def inicio_texto(self) -> str:
+        """La hora de inicio con formato "HH:MM" (ej. "07:30")."""
+        return self._inicio_texto
+
+    @property
+    def fin_texto(self) -> str:
+        """La hora de fin con formato "HH:MM"."""
+        return self._fin_texto
+
+    @property
+    def mascara(self) -> int:
+        """Máscara de bits con los minutos de la semana que ocupa el bloque (ver MINUTOS_POR_DIA)."""
+        return self._mascara
+
     @property
     def duracion_minutos(self) -> int:
         """Calcula la duración del bloque en minutos."""
-        # Se convierte a minutos para evitar problemas con la resta de objetos time.
-        inicio_minutos = self.inicio.hour * 60 + self.inicio.minute
-        fin_minutos = self.fin.hour * 60 + self.fin.minute
-        return fin_minutos - inicio_minutos
+        # Usamos los minutos precalculados para evitar problemas con la resta de objetos time.
+        return self._fin_min - self._inicio_min
 
     # --- Métodos "mágicos" (Dunder methods) ---
 
@@ -118,7 +196,7 @@ class BloqueHoras:
         Representación textual legible para el usuario final. Se invoca al usar print(objeto).
         ej. Lunes de 07:00 a 09:00
         """
-        return f"{self.dia.value} de {self.inicio.strftime('%H:%M')} a {self.fin.strftime('%H:%M')}"
+        return f"{self._dia.etiqueta} de {self._inicio_texto} a {self._fin_texto}"
 
     def __eq__(self, otro: object) -> bool:
         """
@@ -134,8 +212,9 @@ class BloqueHoras:
         Permite que los objetos BloqueHoras se puedan usar en colecciones
         basadas en hash, como sets o como llaves de diccionarios.
         Esencial para operaciones eficientes como eliminar duplicados.
+        Se calcula una sola vez en __init__ en lugar de armar y hashear una tupla en cada llamada.
         """
-        return hash((self.dia, self.inicio, self.fin))
+        return self._hash
 
     def __lt__(self, otro: object) -> bool:
         """
@@ -144,21 +223,25 @@ class BloqueHoras:
         """
         if not isinstance(otro, BloqueHoras):
             return NotImplemented
-        # Mapeamos días a números para poder compararlos, la posición (el índice) de cada día representa su orden en la semana
-        dias_ordenados = list(DiaSemana)
-        if self.dia != otro.dia:
-            return dias_ordenados.index(self.dia) < dias_ordenados.index(otro.dia)
-        return self.inicio < otro.inicio
+        # La llave es el minuto de la semana en el que empieza el bloque: comparar ese entero equivale a comparar
+        # primero el día y luego la hora de inicio.
+        return self._clave_orden < otro._clave_orden
 
     # --- Métodos Públicos ---
 
     def se_solapa_con(self, otro_bloque: 'BloqueHoras') -> bool:
         """Verifica si este bloque de horario choca con otro."""
-        if self.dia != otro_bloque.dia:
+        if self._dia != otro_bloque._dia:
             return False # No pueden chocar si son en días diferentes
 
-        # Dos bloques [A, B] y [C, D] se solapan si A < D y C < B
-        return self.inicio < otro_bloque.fin and otro_bloque.inicio < self.fin
+        # Dos bloques [A, B] y [C, D] se solapan si A < D y C < B. Comparar minutos enteros da el mismo resultado
+        # que comparar las horas, porque ningún bloque tiene segundos (ver _validar_y_convertir_hora).
+        return self._inicio_min < otro_bloque._fin_min and otro_bloque._inicio_min < self._fin_min
+
+
+# Llave para sorted()/sort() equivalente al orden natural (__lt__), pero implementada en C: evita llamar a un
+# método de Python en cada comparación. Uso: sorted(bloques, key=CLAVE_ORDEN)
+CLAVE_ORDEN = attrgetter('_clave_orden')
 
 
 # --- Ejemplo de uso ---
@@ -196,7 +279,7 @@ if __name__ == "__main__":
             f"¿Cálculo ({bloque_calculo_L.inicio.strftime('%H:%M')}-{bloque_calculo_L.fin.strftime('%H:%M')}) se solapa con Programación ({bloque_programacion_L.inicio.strftime('%H:%M')}-{bloque_programacion_L.fin.strftime('%H:%M')})? "
             f"{bloque_calculo_L.se_solapa_con(bloque_programacion_L)}")  # No se solapan, uno termina justo cuando el otro empieza
 
-        print(f"¿Cálculo ({bloque_calculo_L.dia.value}) se solapa con Ética ({bloque_etica_M.dia.value})? "
+        print(f"¿Cálculo ({bloque_calculo_L.dia.etiqueta}) se solapa con Ética ({bloque_etica_M.dia.etiqueta})? "
               f"{bloque_calculo_L.se_solapa_con(bloque_etica_M)}")
         print("-" * 20)
 
@@ -216,6 +299,16 @@ if __name__ == "__main__":
         print("-" * 20)
 
         print(f"\nDuración de la clase de Ética: {bloque_etica_M.duracion_minutos} minutos.")
+        print("-" * 20)
+
+        print("\n--- Validación de Horas con Segundos ---")
+        try:
+            # 08:00:30 no cabe en la resolución de minutos: truncarla ocultaría un choque con una clase de 08:00
+            BloqueHoras(DiaSemana.LUNES, time(7, 30), time(8, 0, 30))
+            print("ERROR: Se aceptó una hora con segundos.")
+        except ValueError as e:
+            print(f"ÉXITO: Se rechazó la hora correctamente.")
+            print(f"  Mensaje: {e}")
 
     except (ValueError, TypeError) as e:
         print(f"\nERROR: Ha ocurrido un problema al crear un bloque de horario.")
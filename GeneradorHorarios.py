@@ -1,45 +1,368 @@
 # Archivo: GeneradorHorarios.py
-from itertools import combinations, product
+from bisect import bisect_left
+from functools import cache
+from itertools import combinations
 from Asignatura import Asignatura
+from BloqueHoras import MINUTOS_POR_DIA
 from Grupo import Grupo
 from Horario import Horario
-from typing import List, Generator, Dict
+from typing import List, Generator, Tuple
 
+# NumPy y Numba son dependencias opcionales. En búsquedas grandes, con Numba (o con el módulo precompilado que
+# genera compilar_solver.py) la búsqueda de combinaciones corre en código máquina; en las demás, o sin Numba, se
+# usa el recorrido en Python puro (ver MOTORES). NumPy solo hace falta para pasarle los datos al núcleo compilado.
+# Todas las variantes producen exactamente los mismos horarios.
+# Ambas se importan solo cuando hacen falta (ver _importar_numpy y _obtener_buscar): importar Numba tarda más que
+# resolver en Python puro un catálogo como el de main.py.
+np = None  # Se asigna en _importar_numpy()
 
-def encontrar_horarios(catalogo: List[Asignatura], num_materias: int) -> Generator[Horario, None, None]:
+_BITS_POR_PALABRA = 64
+
+# Número máximo de combinaciones que el núcleo compilado devuelve por llamada (ver _buscar).
+_TAMANO_LOTE = 4096
+
+# Tamaño de búsqueda (ver _tamano_busqueda) a partir del cual "auto" usa el núcleo compilado. Importar y preparar
+# Numba cuesta alrededor de medio segundo, y convertir cada resultado en un Horario cuesta lo mismo en ambos
+# recorridos: por debajo de este orden de magnitud el recorrido en Python puro termina antes.
+_UMBRAL_NUMBA = 50_000_000
+
+# Versión del núcleo compilado (_buscar). Hay que incrementarla cada vez que cambie su firma o el significado de sus
+# arreglos: compilar_solver.py la graba en el módulo que genera y solo se usa un módulo con la misma versión.
+_VERSION_NUCLEO = 3
+
+# Fases de la búsqueda compilada, guardadas en estado[0] entre lotes.
+_BUSQUEDA_NUEVA = 0
+_BUSQUEDA_EN_CURSO = 1
+_BUSQUEDA_TERMINADA = 2
+
+# Recorridos que acepta encontrar_horarios. "auto" elige entre "numba" y "python" según las dependencias instaladas y
+# el tamaño de la búsqueda (ver _UMBRAL_NUMBA).
+MOTORES = ("auto", "python", "numba")
+
+
+def encontrar_horarios(catalogo: List[Asignatura], num_materias: int,
+                       motor: str = "auto") -> Generator[Horario, None, None]:
     """
     El motor principal. Genera todas las combinaciones de horarios válidos. Utiliza un generador para producir objetos
     Horario válidos uno a la vez, lo cual es muy eficiente en memoria.
 
     :param catalogo: La lista completa de objetos Asignatura disponibles.
     :param num_materias: El número de materias que el usuario desea cursar.
+    :param motor: (Opcional) El recorrido a usar, uno de MOTORES. Todos producen exactamente los mismos horarios.
     :yields: Un objeto Horario válido y sin conflictos.
+    :raises ValueError: Si el motor no es uno de MOTORES.
+    :raises ImportError: Si el motor pedido necesita una dependencia que no está instalada.
     """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: '{motor}'. Opciones: {', '.join(MOTORES)}.")
+
+    # Invariante: las asignaturas se recorren de menos a más grupos. Los choques entre materias con pocas opciones
+    # aparecen en los primeros niveles de la búsqueda y podan ramas más grandes. Lo aplicamos aquí (sobre una copia
+    # y de forma estable) para que no dependa de que quien llama haya ordenado el catálogo.
+    catalogo = sorted(catalogo, key=len)
+
+    if motor == "auto":
+        # El orden importa: con catálogos pequeños no llegamos a importar Numba.
+        grande = _tamano_busqueda(catalogo, num_materias) >= _UMBRAL_NUMBA
+        motor = "numba" if grande and _obtener_buscar() is not None else "python"
+
+    if motor == "numba":
+        if _obtener_buscar() is None:
+            raise ImportError("El motor 'numba' requiere Numba (o el módulo que genera compilar_solver.py).")
+        return _encontrar_horarios_numba(catalogo, num_materias)
+    return _encontrar_horarios_python(catalogo, num_materias)
+
+
+def _tamano_busqueda(catalogo: List[Asignatura], num_materias: int) -> int:
+    """
+    Número de combinaciones de grupos (uno por materia) que habría que revisar sin ninguna poda: la suma, sobre cada
+    subconjunto de num_materias materias, del producto de sus números de grupos. Se calcula sin recorrer los
+    subconjuntos, agregando las materias una a una (O(n·k)).
+    """
+    if num_materias < 0:
+        return 0
+    # totales[j]: la misma suma, pero para subconjuntos de j materias entre las agregadas hasta ahora
+    totales = [1] + [0] * num_materias
+    for asignatura in catalogo:
+        for j in range(num_materias, 0, -1):
+            totales[j] += totales[j - 1] * len(asignatura)
+    return totales[num_materias]
+
+
+def _encontrar_horarios_python(catalogo: List[Asignatura], num_materias: int) -> Generator[Horario, None, None]:
+    """Recorrido en Python puro: búsqueda en profundidad sobre los grupos que poda en cuanto aparece un choque."""
+
+    # Fase 0: Precalcular, una sola vez para todo el recorrido, los grupos de cada asignatura y qué pares de
+    # asignaturas pueden cursarse juntas. Dentro de los ciclos solo indexamos estas listas.
+    grupos_por_asignatura = [a.grupos for a in catalogo]
+    compatibles = _pares_compatibles(grupos_por_asignatura)
 
     # Fase 1: Generar cada posible subconjunto de asignaturas
-    for conjunto_materias in combinations(catalogo, num_materias):
+    for indices in combinations(range(len(catalogo)), num_materias):
+
+        # Si algún par de asignaturas del subconjunto es incompatible, ninguna combinación de sus grupos
+        # puede ser válida: descartamos el subconjunto completo sin generar su producto cartesiano.
+        if not all(compatibles[i][j] for i, j in combinations(indices, 2)):
+            continue
+
+        # Como el catálogo ya viene ordenado, las materias del subconjunto también van de menos a más grupos.
+        conjunto_materias = tuple(catalogo[i] for i in indices)
 
         # Creamos una lista donde cada elemento es una lista de grupos disponibles para cada asignatura
-        # ej: [ [G1_Calc, G2_Calc], [G1_Fis], [G1_Prog, G2_Prog] ]
-        lista_de_grupos_por_materia = [m.grupos for m in conjunto_materias]
+        # ej: [ [G1_Fis], [G1_Calc, G2_Calc], [G1_Prog, G2_Prog] ]
+        lista_de_grupos_por_materia = [grupos_por_asignatura[i] for i in indices]
+
+        # Fase 2: Recorrer las combinaciones de grupos (tomando un grupo por asignatura) que no chocan entre sí.
+        # 'horario_propuesto' será una tupla de Grupos, ej: (G1_Fis, G1_Calc, G2_Prog)
+        for horario_propuesto_tupla in _combinaciones_sin_choques(lista_de_grupos_por_materia, 0, 0, []):
+
+            # Fase 3: Entregar el Horario. Como ya está validado, usamos el constructor rápido, que recibe las
+            # tuplas paralelas (Asignatura_A, Asignatura_B) y (Grupo_A1, Grupo_B1) sin armar un diccionario.
+            yield Horario._desde_validado(conjunto_materias, horario_propuesto_tupla)
+
+
+def _combinaciones_sin_choques(grupos_por_materia: List[Tuple[Grupo, ...]], nivel: int, acumulado: int,
+                               elegidos: List[Grupo]) -> Generator[Tuple[Grupo, ...], None, None]:
+    """
+    Búsqueda en profundidad que elige un grupo por materia a partir de 'nivel'. 'acumulado' es la máscara de los
+    minutos ya ocupados por 'elegidos'; si un grupo choca con ella, se descarta junto con todas las combinaciones
+    que lo incluirían, en lugar de generarlas y rechazarlas una por una como haría itertools.product.
+    """
+    if nivel == len(grupos_por_materia):
+        yield tuple(elegidos)
+        return
+
+    for grupo in grupos_por_materia[nivel]:
+        mascara = grupo.mascara_ocupacion
+        if acumulado & mascara:
+            continue  # Poda: este grupo choca con los ya elegidos
+
+        elegidos.append(grupo)
+        yield from _combinaciones_sin_choques(grupos_por_materia, nivel + 1, acumulado | mascara, elegidos)
+        elegidos.pop()
+
+
+def _pares_compatibles(grupos_por_asignatura: List[Tuple[Grupo, ...]]) -> List[List[bool]]:
+    """
+    Construye la matriz (n x n) que indica, para cada par de asignaturas, si existe al menos un grupo de la primera
+    que no choque con algún grupo de la segunda.
+    """
+    n = len(grupos_por_asignatura)
+    # Leemos la máscara de cada grupo una sola vez: cada asignatura participa en n-1 pares, y así el ciclo
+    # interno solo hace ANDs entre enteros en lugar de llamar a la propiedad en cada comparación.
+    mascaras = [tuple(g.mascara_ocupacion for g in grupos) for grupos in grupos_por_asignatura]
+    compatibles = [[True] * n for _ in range(n)]
+    for i, j in combinations(range(n), 2):
+        hay_pareja = any(not (mi & mj) for mi in mascaras[i] for mj in mascaras[j])
+        compatibles[i][j] = compatibles[j][i] = hay_pareja
+    return compatibles
+
+
+def _encontrar_horarios_numba(catalogo: List[Asignatura], num_materias: int) -> Generator[Horario, None, None]:
+    """
+    Recorrido acelerado con Numba. Cada grupo se traduce a una máscara de bits; el núcleo compilado (_buscar)
+    descarta los choques con un AND por grupo y devuelve los índices de las combinaciones válidas por lotes de a lo
+    sumo _TAMANO_LOTE, que aquí convertimos en objetos Horario. Entre un lote y otro el núcleo guarda su posición
+    en arreglos de estado, así que la memoria no crece con el número de horarios encontrados.
+    """
+    if num_materias < 0:
+        raise ValueError("El número de materias a cursar no puede ser negativo.")
+    if num_materias > len(catalogo):
+        return
+
+    grupos_por_materia = [m.grupos for m in catalogo]
+    mascaras, desplazamientos = _construir_mascaras(grupos_por_materia)
+    # Los grupos en el mismo orden que las filas de 'mascaras': el núcleo devuelve directamente esas filas
+    grupos_planos = [grupo for grupos in grupos_por_materia for grupo in grupos]
+
+    # Estado de la búsqueda, que el núcleo actualiza entre lotes (ver _buscar)
+    materias = np.arange(num_materias, dtype=np.int32)
+    eleccion = np.zeros(num_materias, dtype=np.int32)
+    acumulado = np.zeros((num_materias + 1, mascaras.shape[1]), dtype=np.uint64)
+    estado = np.zeros(2, dtype=np.int64)
+    # Búferes de salida, reutilizados en cada lote
+    sol_materias = np.empty((_TAMANO_LOTE, num_materias), dtype=np.int32)
+    sol_grupos = np.empty((_TAMANO_LOTE, num_materias), dtype=np.int32)
+
+    buscar = _obtener_buscar()
+    while estado[0] != _BUSQUEDA_TERMINADA:
+        n_soluciones = buscar(mascaras, desplazamientos, materias, eleccion, acumulado, estado,
+                              sol_materias, sol_grupos)
+        fila_anterior, conjunto_materias = None, ()
+        for fila_materias, fila_grupos in zip(sol_materias[:n_soluciones].tolist(),
+                                              sol_grupos[:n_soluciones].tolist()):
+            # Las combinaciones salen agrupadas por subconjunto: solo armamos la tupla de materias cuando cambia.
+            if fila_materias != fila_anterior:
+                fila_anterior, conjunto_materias = fila_materias, tuple(catalogo[i] for i in fila_materias)
+            yield Horario._desde_validado(conjunto_materias, tuple(grupos_planos[i] for i in fila_grupos))
 
-        # Fase 2: Generar cada posible combinación de grupos (tomando un grupo por asignatura).
-        # 'horario_propuesto' será una tupla de Grupos, ej: (G1_Calc, G1_Fis, G2_Prog)
-        for horario_propuesto_tupla in product(*lista_de_grupos_por_materia):
 
-            # Fase 3: Ensamblar el diccionario y VALIDAR a través del constructor de Horario.
-            # zip crea los pares: (Asignatura_A, Grupo_A1) y (Asignatura_B, Grupo_B1)
-            seleccion_dict: Dict[Asignatura, Grupo] = dict(zip(conjunto_materias, horario_propuesto_tupla))
+def _intervalos_de(grupo: Grupo) -> List[Tuple[int, int]]:
+    """Convierte los bloques de un grupo en intervalos [inicio, fin) medidos en minutos desde el lunes a las 00:00."""
+    intervalos = []
+    for bloque in grupo.horarios:
+        desplazamiento = bloque.dia * MINUTOS_POR_DIA
+        intervalos.append((desplazamiento + bloque.inicio_minutos, desplazamiento + bloque.fin_minutos))
+    return intervalos
+
+
+def _construir_mascaras(grupos_por_materia: List[List[Grupo]]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Traduce cada grupo del catálogo a una máscara de bits repartida en palabras de 64 bits.
+
+    En lugar de un bit fijo por cada media hora, cada bit representa uno de los tramos elementales que quedan entre
+    dos horas de inicio/fin consecutivas del catálogo. Así la máscara es exacta para cualquier hora (ej. 08:15) y,
+    en catálogos reales, cabe en una sola palabra.
 
-            try:
-                # Intentamos crear el objeto Horario.
-                # El propio __init__ de Horario llamará a _validar_conflictos.
-                horario_valido = Horario(seleccion_dict)
+    Las máscaras de todos los grupos se guardan contiguas en un solo arreglo (sin relleno hasta el máximo de grupos
+    por materia): los grupos de la materia i ocupan las filas desplazamientos[i] .. desplazamientos[i + 1] - 1.
+
+    :returns: (mascaras, desplazamientos) con forma (n_grupos_total, n_palabras) y (n_asignaturas + 1,).
+    """
+    intervalos = [[_intervalos_de(g) for g in grupos] for grupos in grupos_por_materia]
+    fronteras = sorted({extremo for materia in intervalos for grupo in materia
+                        for intervalo in grupo for extremo in intervalo})
+
+    n_tramos = max(len(fronteras) - 1, 1)
+    n_palabras = (n_tramos + _BITS_POR_PALABRA - 1) // _BITS_POR_PALABRA
+    desplazamientos = np.zeros(len(grupos_por_materia) + 1, dtype=np.int32)
+    desplazamientos[1:] = np.cumsum([len(grupos) for grupos in grupos_por_materia])
+
+    mascaras = np.zeros((int(desplazamientos[-1]), n_palabras), dtype=np.uint64)
+    fila = 0
+    for materia in intervalos:
+        for grupo in materia:
+            mascara = 0
+            for inicio, fin in grupo:
+                primero, ultimo = bisect_left(fronteras, inicio), bisect_left(fronteras, fin)
+                mascara |= ((1 << (ultimo - primero)) - 1) << primero
+            for p in range(n_palabras):
+                mascaras[fila, p] = (mascara >> (p * _BITS_POR_PALABRA)) & 0xFFFFFFFFFFFFFFFF
+            fila += 1
+
+    return mascaras, desplazamientos
+
+
+def _buscar(mascaras, desplazamientos, materias, eleccion, acumulado, estado, sol_materias, sol_grupos):
+    """
+    Núcleo de la búsqueda (compilado con Numba, ver _obtener_buscar). Recorre los subconjuntos de materias en orden
+    lexicográfico y, para cada uno, hace una búsqueda en profundidad sobre sus grupos acumulando la máscara ocupada:
+    en cuanto un grupo choca con lo acumulado se poda toda la rama.
 
-                # Si la línea anterior no lanzó un error, el horario es válido. Lo entregamos.
-                yield horario_valido
+    La búsqueda avanza por lotes: escribe combinaciones en sol_materias/sol_grupos hasta llenarlos y regresa. Su
+    posición queda en los arreglos de estado, de modo que la siguiente llamada con los mismos arreglos continúa donde
+    se quedó. Quien llama inicializa materias = [0, 1, ..., k-1], estado = [_BUSQUEDA_NUEVA, 0] y acumulado en ceros.
 
-            except ValueError:
-                # Si Horario() lanza un ValueError, significa que hay un conflicto.
-                # Simplemente lo ignoramos y continuamos con la siguiente combinación.
-                continue
\ No newline at end of file
+    :param materias: (k,) Subconjunto de materias actual.
+    :param eleccion: (k,) Grupo elegido en cada nivel, relativo a su materia.
+    :param acumulado: (k + 1, n_palabras) Máscara ocupada antes de cada nivel.
+    :param estado: (2,) [fase, nivel]; la fase es _BUSQUEDA_NUEVA, _BUSQUEDA_EN_CURSO o _BUSQUEDA_TERMINADA.
+    :returns: El número de combinaciones escritas en este lote (las primeras filas de sol_materias y sol_grupos).
+              Cada fila de sol_grupos guarda las filas de los grupos elegidos en el arreglo plano de máscaras.
+    """
+    num_materias = materias.shape[0]
+    n_asignaturas = desplazamientos.shape[0] - 1
+    n_palabras = mascaras.shape[1]
+    capacidad = sol_materias.shape[0]
+    n_soluciones = 0
+
+    if estado[0] == _BUSQUEDA_TERMINADA:
+        return 0
+    en_curso = estado[0] == _BUSQUEDA_EN_CURSO
+    nivel = estado[1]
+
+    while True:
+        if not en_curso:
+            if num_materias == 0:
+                # Sin materias que elegir solo existe la combinación vacía
+                estado[0] = _BUSQUEDA_TERMINADA
+                return 1
+            nivel = 0
+            eleccion[0] = -1
+
+        # Fase 2: búsqueda en profundidad sobre los grupos del subconjunto actual.
+        while nivel >= 0:
+            eleccion[nivel] += 1
+            primero = desplazamientos[materias[nivel]]
+            if eleccion[nivel] >= desplazamientos[materias[nivel] + 1] - primero:
+                nivel -= 1  # Se agotaron los grupos de esta materia: regresamos al nivel anterior
+                continue
+
+            fila = primero + eleccion[nivel]  # Fila del grupo elegido dentro del arreglo plano de máscaras
+            choque = False
+            for p in range(n_palabras):
+                if (acumulado[nivel, p] & mascaras[fila, p]) != 0:
+                    choque = True
+                    break
+            if choque:
+                continue  # Poda: ninguna combinación que incluya este grupo puede ser válida
+
+            for p in range(n_palabras):
+                acumulado[nivel + 1, p] = acumulado[nivel, p] | mascaras[fila, p]
+
+            if nivel + 1 < num_materias:
+                nivel += 1
+                eleccion[nivel] = -1
+                continue
+
+            # Fase 3: la combinación está completa y sin choques. Si el lote se llena, guardamos la posición y
+            # regresamos; la siguiente llamada retoma desde el siguiente grupo de este mismo nivel.
+            for j in range(num_materias):
+                sol_materias[n_soluciones, j] = materias[j]
+                sol_grupos[n_soluciones, j] = desplazamientos[materias[j]] + eleccion[j]
+            n_soluciones += 1
+            if n_soluciones == capacidad:
+                estado[0] = _BUSQUEDA_EN_CURSO
+                estado[1] = nivel
+                return n_soluciones
+
+        # Fase 1: avanzar al siguiente subconjunto de materias en orden lexicográfico.
+        en_curso = False
+        i = num_materias - 1
+        while i >= 0 and materias[i] == i + n_asignaturas - num_materias:
+            i -= 1
+        if i < 0:
+            estado[0] = _BUSQUEDA_TERMINADA
+            return n_soluciones
+        materias[i] += 1
+        for j in range(i + 1, num_materias):
+            materias[j] = materias[j - 1] + 1
+
+
+@cache
+def _importar_numpy() -> bool:
+    """Importa NumPy la primera vez que se necesita (en el global 'np'). Devuelve False si no está instalado."""
+    global np
+    try:
+        import numpy
+    except ImportError:
+        return False
+    np = numpy
+    return True
+
+
+@cache
+def _obtener_buscar():
+    """
+    Devuelve el núcleo de la búsqueda compilado, o None si no hay con qué compilarlo. Se resuelve una sola vez.
+
+    Preferimos la versión compilada por adelantado (AOT) con compilar_solver.py: así la primera búsqueda no paga la
+    compilación JIT de Numba, que tarda de cientos de milisegundos a segundos. Si el módulo no existe, compilamos
+    con Numba (y cache=True guarda el resultado en disco para las siguientes ejecuciones).
+    """
+    if not _importar_numpy():
+        return None  # Tanto el módulo AOT como el núcleo de Numba trabajan sobre arreglos de NumPy
+    try:
+        import horario_solver
+    except ImportError:
+        horario_solver = None
+    # Un módulo compilado a partir de otra versión de _buscar fallaría (o daría resultados erróneos) en la primera
+    # búsqueda, así que lo ignoramos si no declara la misma versión. Los más antiguos ni siquiera la declaran.
+    version = getattr(horario_solver, 'version_nucleo', None)
+    if version is not None and version() == _VERSION_NUCLEO:
+        return horario_solver.buscar
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_buscar)
@@ -1,8 +1,11 @@
-from BloqueHoras import BloqueHoras, DiaSemana
-from typing import Optional, List, Set
+from bisect import bisect_left, insort
+from BloqueHoras import BloqueHoras, DiaSemana, CLAVE_ORDEN
+from typing import Optional, List, Tuple
 
 class Grupo:
     """Representa un grupo específico de una asignatura, con un profesor y uno o más bloques de horario asociados."""
+    # Atributos fijos en lugar de un __dict__ por instancia (ver BloqueHoras).
+    __slots__ = ('_id_grupo', '_profesor', '_bloques', '_mascara_ocupacion', '_horarios_ordenados')
 
     def __init__(self, id_grupo: int, profesor: str, bloques_iniciales: Optional[List[BloqueHoras]] = None):
         """
@@ -19,9 +22,15 @@ class Grupo:
 
         self._id_grupo = Grupo._validar_id(id_grupo)
         self._profesor = Grupo._validar_profesor(profesor)
-        # Usar un 'set' es semánticamente más correcto para una colección de
-        # bloques únicos. Esto previene duplicados automáticamente.
-        self._bloques: Set[BloqueHoras] = set()
+        # Una lista basta: la máscara de ocupación ya impide duplicados (un bloque repetido se solapa consigo
+        # mismo), así que no hace falta pagar el hash de cada bloque como en un 'set'.
+        # Se mantiene ordenada por (día, inicio) al insertar, de modo que 'horarios' nunca tiene que ordenarla.
+        self._bloques: List[BloqueHoras] = []
+        # Máscara de bits con todos los minutos ocupados por el grupo: el OR de las máscaras de sus bloques.
+        # Se actualiza en cada agregar_bloque_horario.
+        self._mascara_ocupacion: int = 0
+        # Tupla (inmutable) de los bloques que devuelve 'horarios'. Se invalida (None) al agregar un bloque.
+        self._horarios_ordenados: Optional[Tuple[BloqueHoras, ...]] = None
 
         if bloques_iniciales:
             # Si se proporcionan bloques, los agregamos uno por uno para asegurar la validación.
@@ -55,9 +64,17 @@ class Grupo:
         return self._profesor
 
     @property
-    def horarios(self) -> list[BloqueHoras]:
-        """Devuelve una COPIA de la lista de horarios para proteger la encapsulación."""
-        return sorted(self._bloques) # Devolvemos la copia ordenada
+    def horarios(self) -> Tuple[BloqueHoras, ...]:
+        """Devuelve los horarios ordenados en una tupla (inmutable) para proteger la encapsulación."""
+        # La lista ya está ordenada; solo la copiamos a una tupla si la caché fue invalidada.
+        if self._horarios_ordenados is None:
+            self._horarios_ordenados = tuple(self._bloques)
+        return self._horarios_ordenados
+
+    @property
+    def mascara_ocupacion(self) -> int:
+        """Máscara de bits con los minutos de la semana en los que el grupo tiene clase."""
+        return self._mascara_ocupacion
 
     # --- Métodos Públicos ---
 
@@ -73,24 +90,31 @@ class Grupo:
         if not isinstance(nuevo_bloque, BloqueHoras):
             raise TypeError("Solo se pueden agregar objetos de tipo BloqueHoras.")
 
-        # Verificamos que el nuevo bloque no choque con los existentes.
-        for bloque_existente in self._bloques:
-            if nuevo_bloque.se_solapa_con(bloque_existente):
-                raise ValueError(f"Conflicto de horario interno en el grupo {self.id_grupo}. "
-                                 f"El bloque '{nuevo_bloque}' se solapa con '{bloque_existente}'.")
-
-        self._bloques.add(nuevo_bloque)
+        # Verificamos que el nuevo bloque no choque con los existentes: basta un AND con la máscara del grupo.
+        # Es exacto porque BloqueHoras solo admite horas HH:MM (sin segundos): todo bloque ocupa al menos un minuto
+        # entero, así que su máscara nunca queda vacía ni se trunca.
+        if nuevo_bloque.mascara & self._mascara_ocupacion:
+            # Solo en el caso (raro) de conflicto buscamos con qué bloque choca, para dar un mensaje claro.
+            # Como los bloques están ordenados y no se solapan entre sí, basta revisar los dos vecinos de la
+            # posición donde se insertaría: el anterior y el siguiente.
+            posicion = bisect_left(self._bloques, CLAVE_ORDEN(nuevo_bloque), key=CLAVE_ORDEN)
+            vecinos = self._bloques[max(posicion - 1, 0):posicion + 1]
+            bloque_existente = next(b for b in vecinos if nuevo_bloque.se_solapa_con(b))
+            raise ValueError(f"Conflicto de horario interno en el grupo {self.id_grupo}. "
+                             f"El bloque '{nuevo_bloque}' se solapa con '{bloque_existente}'.")
+
+        # Búsqueda binaria de la posición (O(log n)) para mantener la lista ordenada por (día, inicio).
+        insort(self._bloques, nuevo_bloque, key=CLAVE_ORDEN)
+        self._mascara_ocupacion |= nuevo_bloque.mascara
+        self._horarios_ordenados = None
 
     def se_solapa_con(self, otro_grupo: 'Grupo') -> bool:
         """
         Verifica si este grupo tiene algún conflicto de horario con otro grupo.
         """
-        # Comparamos cada uno de nuestros bloques con cada uno de los bloques del otro grupo.
-        for mi_bloque in self._bloques:
-            for su_bloque in otro_grupo._bloques:
-                if mi_bloque.se_solapa_con(su_bloque):
-                    return True  # Encontramos un conflicto, terminamos la búsqueda.
-        return False  # No se encontró ningún conflicto.
+        # En lugar de comparar cada uno de nuestros bloques con cada uno de los del otro grupo,
+        # basta con un AND entre las máscaras: si comparten algún minuto, hay conflicto.
+        return (self._mascara_ocupacion & otro_grupo._mascara_ocupacion) != 0
 
         # --- Dunder Methods ---
 
@@ -177,6 +201,16 @@ if __name__ == "__main__":
     except ValueError as e:
         print(f"ÉXITO: Se detectó el error correctamente.")
         print(f"  Mensaje: {e}")
+
+    try:
+        print("Intentando crear un grupo con un bloque de segundos dentro de otro bloque...")
+        # Esto debería fallar: truncado a minutos, 07:20:30-07:20:45 no ocuparía ningún minuto y pasaría la validación
+        Grupo(9, "Prof. Prueba", [BloqueHoras(DiaSemana.LUNES, "07:00", "08:00"),
+                                  BloqueHoras(DiaSemana.LUNES, "07:20:30", "07:20:45")])
+        print("ERROR: Se aceptó el grupo.")
+    except ValueError as e:
+        print(f"ÉXITO: Se detectó el error correctamente.")
+        print(f"  Mensaje: {e}")
     print("-" * 30)
 
     # --- Probando __eq__ y __hash__ ---
@@ -1,14 +1,17 @@
 # Archivo: Horario.py
-from BloqueHoras import DiaSemana, BloqueHoras
+from BloqueHoras import DiaSemana, BloqueHoras, DIAS_SEMANA
 from Asignatura import Asignatura
 from Grupo import Grupo
-from typing import List, Dict, Tuple, Iterable
+from typing import List, Dict, Tuple, Iterable, Optional
 
 class Horario:
     """
     Representa una única combinación validada de asignaturas y grupos que no
     presentan conflictos de horario entre sí.
     """
+    # Atributos fijos en lugar de un __dict__ por instancia: el generador crea un Horario por cada combinación
+    # válida, así que cada byte y cada búsqueda de atributo cuentan (ver BloqueHoras).
+    __slots__ = ('_seleccion', '_asignaturas', '_grupos', '_bloques_organizados')
 
     def __init__(self, seleccion: Dict[Asignatura, Grupo]):
         """
@@ -25,46 +28,108 @@ class Horario:
         if not isinstance(seleccion, dict):
             raise TypeError("La selección debe ser un diccionario de {Asignatura: Grupo}.")
 
-        self._seleccion = seleccion
+        self._seleccion: Optional[Dict[Asignatura, Grupo]] = seleccion
+        # Internamente guardamos la selección como dos tuplas paralelas (asignaturas[i] -> grupos[i]).
+        self._asignaturas: Tuple[Asignatura, ...] = tuple(seleccion.keys())
+        self._grupos: Tuple[Grupo, ...] = tuple(seleccion.values())
         self._validar_conflictos() # Método privado
-        self._bloques_organizados = self._organizar_para_vista() # Método privado
+        # La vista por día solo hace falta para imprimir: se construye la primera vez que se llama a __str__.
+        self._bloques_organizados: Optional[List[List[Tuple[BloqueHoras, str]]]] = None
+
+    @classmethod
+    def _desde_validado(cls, asignaturas: Tuple[Asignatura, ...], grupos: Tuple[Grupo, ...]) -> 'Horario':
+        """
+        Constructor interno para selecciones que ya se sabe que no tienen conflictos (ej. las que produce
+        GeneradorHorarios). Omite _validar_conflictos para no repetir la misma comprobación dos veces, y recibe
+        tuplas paralelas para no construir (ni hashear) un diccionario por cada horario generado.
+        """
+        horario = cls.__new__(cls)
+        horario._asignaturas = asignaturas
+        horario._grupos = grupos
+        horario._seleccion = None  # El diccionario se construye solo si alguien lo pide
+        horario._bloques_organizados = None
+        return horario
+
+    @classmethod
+    def intentar_construir(cls, seleccion: Dict[Asignatura, Grupo]) -> Optional['Horario']:
+        """
+        Variante de Horario(seleccion) que devuelve None en lugar de lanzar ValueError cuando hay un conflicto.
+        Pensada para quien prueba muchas selecciones y descarta la mayoría: lanzar y atrapar una excepción por
+        cada combinación rechazada es mucho más caro que revisar un valor de retorno.
+
+        Raises:
+            TypeError: Si la selección no es un diccionario.
+        """
+        if not isinstance(seleccion, dict):
+            raise TypeError("La selección debe ser un diccionario de {Asignatura: Grupo}.")
+
+        grupos = tuple(seleccion.values())
+        if cls._hay_conflicto(grupos):
+            return None
+        horario = cls._desde_validado(tuple(seleccion.keys()), grupos)
+        horario._seleccion = seleccion
+        return horario
+
+    @staticmethod
+    def _hay_conflicto(grupos: Iterable[Grupo]) -> bool:
+        """
+        Indica si alguno de los grupos choca con otro. A diferencia de _validar_conflictos no lanza excepciones,
+        por lo que es la forma barata de descartar combinaciones (ver intentar_construir).
+        """
+        # Acumulamos en una sola máscara los minutos ya ocupados: cada grupo se comprueba con un único AND.
+        acumulado = 0
+        for grupo in grupos:
+            mascara = grupo.mascara_ocupacion
+            if acumulado & mascara:
+                return True
+            acumulado |= mascara
+        return False
 
     def _validar_conflictos(self):
         """Método interno para asegurar que no hay solapamientos. Si hay
             solapamientos, regresamos ValueError, de lo contrario seguimos normal"""
-        grupos_a_validar = list(self._seleccion.values()) # Lista de values=Grupos
-        for i in range(len(grupos_a_validar)): # Recorremos cada Grupo
-            for j in range(i + 1, len(grupos_a_validar)):
-                grupo1 = grupos_a_validar[i]
-                grupo2 = grupos_a_validar[j]
+        # La comprobación en sí es la de _hay_conflicto (una máscara acumulada, O(k)). Solo si falla comparamos los
+        # grupos por pares, para reportar cuáles chocan.
+        if not self._hay_conflicto(self._grupos):
+            return
+
+        pares = tuple(zip(self._asignaturas, self._grupos))  # Pares (asignatura, grupo), sin indexar listas
+        for i, (asignatura1, grupo1) in enumerate(pares):
+            for asignatura2, grupo2 in pares[i + 1:]:
                 if grupo1.se_solapa_con(grupo2):
                     raise ValueError(f"Conflicto de horario detectado entre:\n"
-                                     f" - {grupo1.id_grupo} ({list(self._seleccion.keys())[i].nombre})\n"
-                                     f" - {grupo2.id_grupo} ({list(self._seleccion.keys())[j].nombre})")
+                                     f" - {grupo1.id_grupo} ({asignatura1.nombre})\n"
+                                     f" - {grupo2.id_grupo} ({asignatura2.nombre})")
 
-    def _organizar_para_vista(self) -> Dict[DiaSemana, List[Tuple[BloqueHoras, str]]]:
+    def _organizar_para_vista(self) -> List[List[Tuple[BloqueHoras, str]]]:
         """Pre-procesa los bloques para una visualización eficiente."""
 
-        # Creamos una lista vacía para cada día de la semana
-        bloques_por_dia = {dia: [] for dia in DiaSemana}
+        # Creamos una lista vacía para cada día de la semana. Como DiaSemana es un IntEnum (LUNES=0, ...),
+        # el propio día sirve de índice: una lista es más ligera que un diccionario con el enum como llave.
+        bloques_por_dia = [[] for _ in DIAS_SEMANA]
 
         # Recorremos la <asignatura, grupo> del horario
-        for asignatura, grupo in self._seleccion.items():
+        for asignatura, grupo in zip(self._asignaturas, self._grupos):
+            # El texto es el mismo para todos los bloques del grupo: lo armamos una sola vez
+            info_str = f"{asignatura.nombre} (Gpo {grupo.id_grupo}) - {grupo.profesor}"
             # Recorremos los bloques de horas de cada grupo
             for bloque in grupo.horarios:
-                info_str = f"{asignatura.nombre} (Gpo {grupo.id_grupo}) - {grupo.profesor}"
                 bloques_por_dia[bloque.dia].append((bloque, info_str))
 
         # Ordenar los bloques dentro de cada día por hora de inicio
-        for dia in bloques_por_dia:
-            bloques_por_dia[dia].sort(key=lambda item: item[0].inicio)
+        for bloques_info in bloques_por_dia:
+            # Dentro de un mismo día basta comparar los minutos de inicio (enteros) en lugar de objetos 'time'.
+            bloques_info.sort(key=lambda item: item[0].inicio_minutos)
 
         return bloques_por_dia
 
     # --- Propiedades Públicas de Solo Lectura ---
 
     @property
-    def seleccion(self):
+    def seleccion(self) -> Dict[Asignatura, Grupo]:
+        """Diccionario {Asignatura: Grupo} del horario. Se construye la primera vez que se solicita."""
+        if self._seleccion is None:
+            self._seleccion = dict(zip(self._asignaturas, self._grupos))
         return self._seleccion
 
     # Magic Methods
@@ -74,24 +139,26 @@ class Horario:
         output = ["========================================", "          HORARIO PROPUESTO           ",
                   "========================================"]
 
-        for dia in DiaSemana:
-            bloques_info = self._bloques_organizados[dia]
+        if self._bloques_organizados is None:
+            self._bloques_organizados = self._organizar_para_vista() # Método privado
+
+        for dia, bloques_info in zip(DIAS_SEMANA, self._bloques_organizados):
             if not bloques_info:
                 continue  # No imprimir días sin clases
 
             output.append(f"\n--- {str(dia).upper()} ---")
             for bloque, info_str in bloques_info:
-                output.append(f"  {bloque.inicio:%H:%M} - {bloque.fin:%H:%M} | {info_str}")
+                output.append(f"  {bloque.inicio_texto} - {bloque.fin_texto} | {info_str}")
 
         return "\n".join(output)
 
     def __len__(self) -> int:
         """Devuelve el número de asignaturas en el horario."""
-        return len(self._seleccion)
+        return len(self._asignaturas)
 
     def __iter__(self) -> Iterable[Tuple[Asignatura, Grupo]]:
         """Permite iterar sobre los pares (asignatura, grupo) del horario."""
-        return iter(self._seleccion.items())
+        return zip(self._asignaturas, self._grupos)
 
 
 # ==============================================================================
@@ -0,0 +1,38 @@
+# Archivo: compilar_solver.py
+# Compila por adelantado (AOT) el núcleo de búsqueda de GeneradorHorarios con numba.pycc y genera el módulo de
+# extensión 'horario_solver' junto a este archivo. GeneradorHorarios lo usa automáticamente si existe, de modo
+# que la primera búsqueda de cada ejecución no tiene que esperar a la compilación JIT de Numba.
+#
+# Uso: python compilar_solver.py
+# Numba solo se necesita para compilar; para usar el módulo generado basta con tener NumPy instalado.
+import os
+from numba.pycc import CC
+import GeneradorHorarios
+
+# Firma del núcleo: (mascaras uint64[n_grupos_total, n_palabras], desplazamientos int32[n_asig + 1],
+# materias int32[k], eleccion int32[k], acumulado uint64[k + 1, n_palabras], estado int64[2],
+# sol_materias int32[lote, k], sol_grupos int32[lote, k]) -> número de combinaciones escritas en el lote.
+FIRMA_BUSCAR = 'i8(u8[:,:], i4[:], i4[:], i4[:], u8[:,:], i8[:], i4[:,:], i4[:,:])'
+
+# Versión del núcleo que se compila. Se exporta junto a 'buscar' para que GeneradorHorarios descarte un módulo
+# generado a partir de otra versión de _buscar (ej. antes de actualizar el código) en lugar de fallar al usarlo.
+VERSION_NUCLEO = GeneradorHorarios._VERSION_NUCLEO
+
+
+def _version_nucleo() -> int:
+    return VERSION_NUCLEO
+
+
+def crear_compilador() -> CC:
+    """Configura el compilador AOT: exporta el núcleo _buscar como 'buscar' y su versión como 'version_nucleo'."""
+    cc = CC('horario_solver')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export('buscar', FIRMA_BUSCAR)(GeneradorHorarios._buscar)
+    cc.export('version_nucleo', 'i8()')(_version_nucleo)
+    return cc
+
+
+if __name__ == "__main__":
+    print("Compilando el núcleo de búsqueda (esto puede tardar unos segundos)...")
+    crear_compilador().compile()
+    print("Listo: se generó el módulo 'horario_solver'.")
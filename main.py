@@ -90,6 +90,10 @@ if __name__ == "__main__":
     materias_disponibles = cargar_catalogo_materias()
     print(f"Catálogo cargado con {len(materias_disponibles)} materias.")
 
+    # Ordenamos las materias de menos a más grupos (len(asignatura) es su número de grupos): así los choques
+    # entre materias con pocas opciones descartan antes ramas enteras de la búsqueda.
+    materias_disponibles.sort(key=len)
+
     # 2. Definir cuántas materias queremos cursar
     NUMERO_MATERIAS_A_CURSAR = 4 # Podemos cambiar este número
     print(f"Buscando combinaciones de horarios para {NUMERO_MATERIAS_A_CURSAR} materias de {len(materias_disponibles)} disponbiles")
@@ -98,16 +102,23 @@ if __name__ == "__main__":
     # 3. Generar y visualizar los horarios válidos
     horarios_encontrados = 0
     horarios = GeneradorHorarios.encontrar_horarios(materias_disponibles, NUMERO_MATERIAS_A_CURSAR)
-    lista_horarios = list(horarios) # Convertimos el generador a una lista para poder contar los resultados
 
-    if not lista_horarios:
+    # Consumimos el generador sobre la marcha (sin convertirlo a lista): cada horario se imprime y se descarta.
+    # Como todos los recorridos de GeneradorHorarios entregan sus resultados conforme los encuentran (el compilado,
+    # por lotes de tamaño fijo), la memoria no crece con el número de horarios encontrados.
+    # El total se conoce al final.
+    for horario_valido in horarios:
+        if horarios_encontrados == 0:
+            print("\n¡Éxito! Horarios posibles:")
+        horarios_encontrados += 1
+        # Simplemente imprimimos el objeto Horario.
+        # Python llamará automáticamente a su método __str__
+        print(horario_valido)
+
+    if horarios_encontrados == 0:
         print("\nNo se encontraron combinaciones de horarios válidos.")
     else:
-        print(f"\n¡Éxito! Se encontraron {len(lista_horarios)} horarios posibles:")
-        for i, horario_valido in enumerate(lista_horarios):
-            # Simplemente imprimimos el objeto Horario.
-            # Python llamará automáticamente a su método __str__
-            print(horario_valido)
+        print(f"\nSe encontraron {horarios_encontrados} horarios posibles en total.")
 
 ''' 
     < Otra forma de mandar a imprimir los horarios: >